@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from app.services.crypto_service import CryptoService
+from app.services.indicator_service import IndicatorService
 
 crypto_bp = Blueprint('crypto', __name__)
 crypto_service = CryptoService()
@@ -65,7 +66,16 @@ def get_crypto_history(crypto_id: str):
     days = request.args.get('days', '30')  # 1, 7, 14, 30, 90, 180, 365, max
 
     try:
-        history = crypto_service.get_crypto_history(crypto_id.lower(), days)
+        # CoinGecko only reports rolling 24h volume, not per-bar volume, so VWAP is not available
+        indicators = IndicatorService.parse_indicators(request.args.get('indicators'), allow_vwap=False)  # e.g. sma20,ema50,rsi14,bb20
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    try:
+        history = crypto_service.get_crypto_history(crypto_id.lower(), days, indicators)
         return jsonify({
             'success': True,
             'data': history
@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from app.services.stock_service import StockService
+from app.services.indicator_service import IndicatorService
 
 stocks_bp = Blueprint('stocks', __name__)
 stock_service = StockService()
@@ -50,7 +51,15 @@ def get_stock_history(symbol: str):
     interval = request.args.get('interval', '1d')  # 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo
 
     try:
-        history = stock_service.get_stock_history(symbol.upper(), period, interval)
+        indicators = IndicatorService.parse_indicators(request.args.get('indicators'))  # e.g. sma20,ema50,rsi14,bb20,vwap
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    try:
+        history = stock_service.get_stock_history(symbol.upper(), period, interval, indicators)
         return jsonify({
             'success': True,
             'data': history
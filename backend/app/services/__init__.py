@@ -1,3 +1,4 @@
 from app.services.stock_service import StockService
+from app.services.indicator_service import IndicatorService
 
-__all__ = ['StockService']
+__all__ = ['StockService', 'IndicatorService']
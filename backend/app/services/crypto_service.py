@@ -1,6 +1,7 @@
 import requests
 from typing import List, Dict, Optional
 from datetime import datetime
+from app.services.indicator_service import IndicatorService
 
 
 class CryptoService:
@@ -20,6 +21,7 @@ class CryptoService:
         self._cache: Dict = {}
         self._cache_time: Optional[datetime] = None
         self._cache_duration_seconds = 60  # Cache for 1 minute
+        self._indicators = IndicatorService()
 
     def _get_cached_or_fetch(self, cache_key: str, fetch_fn, cache_duration: int = 60):
         """Generic caching helper."""
@@ -122,8 +124,9 @@ class CryptoService:
 
         return self._get_cached_or_fetch(f"crypto_details_{crypto_id}", fetch, 60)
 
-    def get_crypto_history(self, crypto_id: str, days: str = "30") -> List[Dict]:
-        """Get historical price data for a cryptocurrency."""
+    def get_crypto_history(self, crypto_id: str, days: str = "30",
+                           indicators: Optional[List[str]] = None) -> List[Dict]:
+        """Get historical price data for a cryptocurrency, optionally with technical indicators."""
         def fetch():
             try:
                 url = f"{self.COINGECKO_BASE_URL}/coins/{crypto_id}/market_chart"
@@ -154,7 +157,10 @@ class CryptoService:
                 return []
 
         cache_duration = 300 if int(days) > 7 else 60  # Longer cache for longer periods
-        return self._get_cached_or_fetch(f"crypto_history_{crypto_id}_{days}", fetch, cache_duration)
+        history = self._get_cached_or_fetch(f"crypto_history_{crypto_id}_{days}", fetch, cache_duration)
+        # Indicator state is shared by every range with the same bar granularity
+        granularity = "daily" if int(days) > 1 else "hourly"
+        return self._indicators.apply(f"crypto_{crypto_id}_{granularity}", history, indicators, price_key="price")
 
     def get_top_gainers(self, limit: int = 10) -> List[Dict]:
         """Get top gaining cryptocurrencies in the last 24h."""
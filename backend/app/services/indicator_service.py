@@ -0,0 +1,324 @@
+import re
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+
+
+class IndicatorService:
+    """Service for computing technical indicators over price history.
+
+    Indicator state is cached per base series (symbol and bar interval), and
+    each requested window is located in it by date. When a sliding window
+    such as period=1mo is refetched, only the bars after the last unchanged
+    one are computed. Returned values are always those of a computation over
+    the requested window alone, whatever else is cached.
+    """
+
+    INDICATOR_PATTERN = re.compile(r'^(sma|ema|rsi|bb)(\d+)$|^(vwap)$')
+    MAX_WINDOW = 500
+    BB_STD_MULTIPLIER = 2
+    MAX_SERIES = 1000  # Base series kept in memory
+    MAX_BARS = 5000  # Bars kept per base series, beyond the requested window
+    CACHE_DURATION_SECONDS = 3600  # Drop series and indicators not requested for an hour
+    MAX_CACHED_WINDOWS = 16  # History objects remembered per series for the identity fast path
+    LOCK_STRIPES = 64  # Series locks, so unrelated symbols are computed concurrently
+
+    def __init__(self):
+        # series_key -> {'series', 'state', 'used', 'windows', 'time'}
+        self._series: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()  # Guards self._series only
+        self._series_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+
+    @classmethod
+    def parse_indicators(cls, spec: Optional[str], allow_vwap: bool = True) -> List[str]:
+        """Parse an indicator list such as 'sma20,ema50,rsi14'.
+
+        Raises ValueError for unknown indicators or out-of-range windows.
+        """
+        if not spec:
+            return []
+
+        indicators = []
+        for name in spec.lower().split(','):
+            name = name.strip()
+            if not name:
+                continue
+            match = cls.INDICATOR_PATTERN.match(name)
+            if not match:
+                raise ValueError(f"Unknown indicator '{name}'. Supported: smaN, emaN, rsiN, bbN, vwap")
+            if match.group(2) and not 1 <= int(match.group(2)) <= cls.MAX_WINDOW:
+                raise ValueError(f"Indicator window for '{name}' must be between 1 and {cls.MAX_WINDOW}")
+            if name == 'vwap' and not allow_vwap:
+                raise ValueError("Indicator 'vwap' requires per-bar volume, which this history does not provide")
+            if name not in indicators:
+                indicators.append(name)
+
+        return indicators
+
+    def apply(self, series_key: str, history: List[Dict], indicators: List[str], price_key: str = 'close') -> List[Dict]:
+        """Return a copy of the history with the requested indicator values added to each bar.
+
+        series_key identifies the underlying bar series (e.g. symbol and interval),
+        not the requested window, so overlapping windows share indicator state.
+        """
+        if not indicators or not history:
+            return history
+
+        now = datetime.now()
+        with self._series_locks[hash(series_key) % self.LOCK_STRIPES]:
+            with self._lock:
+                entry = self._series.get(series_key)
+
+            window = entry['windows'].get(id(history)) if entry else None
+            if window is not None and window[0] is history:
+                # Same cached history object as before: the state already covers it
+                offset = window[1]
+            else:
+                entry, offset = self._merge(entry, self._to_series(history, price_key), now)
+                if len(entry['windows']) >= self.MAX_CACHED_WINDOWS:
+                    entry['windows'].clear()
+                entry['windows'][id(history)] = (history, offset)
+
+            for name in indicators:
+                if name not in entry['state']:
+                    entry['state'][name] = self._compute(name, entry['series'], None, 0)
+                entry['used'][name] = now
+            entry['time'] = now
+            # State arrays are replaced rather than modified, so these stay valid outside the lock
+            states = {name: entry['state'][name] for name in indicators}
+            price = entry['series']['price']
+
+            with self._lock:
+                self._series[series_key] = entry
+                self._series.move_to_end(series_key)
+                self._evict(now)
+
+        columns = {}
+        for name in indicators:
+            for field, values in self._outputs(name, states[name], price, offset, len(history)).items():
+                columns[field] = [self._round(value) for value in values.tolist()]
+
+        return [
+            dict(bar, **{field: values[i] for field, values in columns.items()})
+            for i, bar in enumerate(history)
+        ]
+
+    def _evict(self, now: datetime):
+        """Drop the least recently used series once expired or over the size bound."""
+        while self._series:
+            key, entry = next(iter(self._series.items()))
+            expired = (now - entry['time']).total_seconds() >= self.CACHE_DURATION_SECONDS
+            if not expired and len(self._series) <= self.MAX_SERIES:
+                break
+            del self._series[key]
+
+    def _merge(self, entry: Optional[Dict], window: Dict[str, np.ndarray], now: datetime) -> Tuple[Dict, int]:
+        """Merge a fetched window into the cached base series.
+
+        Returns the updated entry and the offset of the window within its series.
+        Indicator state is recomputed only from the first bar that changed, or
+        rebuilt from the window if cached bars other than the last one changed.
+        """
+        if entry:
+            base = entry['series']
+            offset = int(np.searchsorted(base['date'], window['date'][0]))
+            if offset < len(base['date']) and base['date'][offset] == window['date'][0]:
+                changed = self._first_mismatch(base, window, offset)
+                if changed == len(window['date']):
+                    return entry, offset
+
+                # Only splice appended bars or a revised last bar (an in-progress candle).
+                # An earlier mismatch means the history was re-adjusted, e.g. after a split.
+                overlap = min(len(base['date']) - offset, len(window['date']))
+                start = offset + changed
+                # RSI needs the previous bar's averages, which only exist from the second bar
+                if changed >= overlap - 1 and start >= 2:
+                    series = {
+                        key: np.concatenate((values[:start], window[key][changed:]))
+                        for key, values in base.items()
+                    }
+                    state = {
+                        name: self._compute(name, series, entry['state'][name], start)
+                        for name in self._tracked(entry, now)
+                    }
+                    used = {name: entry['used'][name] for name in state}
+                    return self._trim({'series': series, 'state': state, 'used': used, 'windows': {}}, offset)
+
+        # Unknown series, or the window starts outside it: rebuild from the window
+        tracked = self._tracked(entry, now) if entry else []
+        state = {name: self._compute(name, window, None, 0) for name in tracked}
+        used = {name: entry['used'][name] for name in tracked}
+        return {'series': window, 'state': state, 'used': used, 'windows': {}}, 0
+
+    def _tracked(self, entry: Dict, now: datetime) -> List[str]:
+        """Indicators on a series that have been requested recently enough to keep updating."""
+        return [
+            name for name, used in entry['used'].items()
+            if (now - used).total_seconds() < self.CACHE_DURATION_SECONDS
+        ]
+
+    def _trim(self, entry: Dict, offset: int) -> Tuple[Dict, int]:
+        """Drop the oldest bars beyond MAX_BARS, never cutting into the requested window."""
+        drop = min(len(entry['series']['date']) - self.MAX_BARS, offset)
+        if drop > 0:
+            entry['series'] = {key: values[drop:] for key, values in entry['series'].items()}
+            entry['state'] = {
+                name: {key: values[drop:] for key, values in state.items()}
+                for name, state in entry['state'].items()
+            }
+            offset -= drop
+        return entry, offset
+
+    @staticmethod
+    def _to_series(history: List[Dict], price_key: str) -> Dict[str, np.ndarray]:
+        """Convert history bars into NumPy arrays."""
+        price = np.array([bar[price_key] for bar in history], dtype=float)
+        volume = np.array([bar.get('volume', 0) for bar in history], dtype=float)
+        if 'high' in history[0] and 'low' in history[0]:
+            high = np.array([bar['high'] for bar in history], dtype=float)
+            low = np.array([bar['low'] for bar in history], dtype=float)
+            typical = (high + low + price) / 3
+        else:
+            typical = price
+
+        return {
+            'date': np.array([bar['date'] for bar in history], dtype=str),
+            'price': price,
+            'volume': volume,
+            'typical': typical,
+        }
+
+    @staticmethod
+    def _first_mismatch(base: Dict[str, np.ndarray], window: Dict[str, np.ndarray], offset: int) -> int:
+        """Index of the first window bar that differs from the base series from offset onwards.
+
+        A revised last bar (e.g. an in-progress candle) counts as a mismatch.
+        """
+        length = min(len(base['date']) - offset, len(window['date']))
+        mismatch = np.zeros(length, dtype=bool)
+        for key, values in base.items():
+            a, b = values[offset:offset + length], window[key][:length]
+            if key == 'date':
+                mismatch |= a != b
+            else:
+                mismatch |= (a != b) & ~(np.isnan(a) & np.isnan(b))
+
+        changed = np.flatnonzero(mismatch)
+        return int(changed[0]) if len(changed) else length
+
+    def _compute(self, name: str, series: Dict[str, np.ndarray], prev: Optional[Dict], start: int) -> Dict[str, np.ndarray]:
+        """Compute indicator state for bars from start onwards, reusing prev for earlier bars."""
+        match = self.INDICATOR_PATTERN.match(name)
+        kind = match.group(1) or match.group(3)
+        window = int(match.group(2)) if match.group(2) else None
+        price = series['price']
+
+        if kind == 'sma':
+            state = {'sma': _rolling_tail(price, window, start, lambda r: r.mean())}
+        elif kind == 'bb':
+            state = {
+                'middle': _rolling_tail(price, window, start, lambda r: r.mean()),
+                'std': _rolling_tail(price, window, start, lambda r: r.std(ddof=0)),
+            }
+        elif kind == 'ema':
+            seed = prev['ema'][start - 1] if prev else None
+            state = {'ema': _ewm(price[start:], 2 / (window + 1), seed)}
+        elif kind == 'rsi':
+            if prev:
+                delta = np.diff(price[start - 1:])
+                gain_seed, loss_seed = prev['avgGain'][start - 1], prev['avgLoss'][start - 1]
+                avg_gain = _ewm(np.clip(delta, 0, None), 1 / window, gain_seed)
+                avg_loss = _ewm(np.clip(-delta, 0, None), 1 / window, loss_seed)
+            else:
+                delta = np.diff(price)
+                avg_gain = np.concatenate(([np.nan], _ewm(np.clip(delta, 0, None), 1 / window)))
+                avg_loss = np.concatenate(([np.nan], _ewm(np.clip(-delta, 0, None), 1 / window)))
+            state = {'avgGain': avg_gain, 'avgLoss': avg_loss}
+        else:  # vwap
+            pv = series['typical'][start:] * series['volume'][start:]
+            cum_pv = np.cumsum(pv) + (prev['cumPv'][start - 1] if prev else 0)
+            cum_volume = np.cumsum(series['volume'][start:]) + (prev['cumVolume'][start - 1] if prev else 0)
+            state = {'cumPv': cum_pv, 'cumVolume': cum_volume}
+
+        if prev:
+            state = {key: np.concatenate((prev[key][:start], values)) for key, values in state.items()}
+        return state
+
+    def _outputs(self, name: str, state: Dict[str, np.ndarray], price: np.ndarray,
+                 offset: int, length: int) -> Dict[str, np.ndarray]:
+        """Derive the response fields for the bars [offset, offset + length) from cached state.
+
+        Values are those of a computation over these bars alone, so they do not
+        depend on which earlier bars happen to be cached.
+        """
+        match = self.INDICATOR_PATTERN.match(name)
+        window = int(match.group(2)) if match.group(2) else None
+        bars = slice(offset, offset + length)
+        index = np.arange(length)
+
+        if name.startswith('sma'):
+            # Not enough bars yet; later rolling values only read bars inside the window
+            return {name: np.where(index < window - 1, np.nan, state['sma'][bars])}
+        if name.startswith('bb'):
+            middle = np.where(index < window - 1, np.nan, state['middle'][bars])
+            band = self.BB_STD_MULTIPLIER * state['std'][bars]
+            return {
+                f'{name}Upper': middle + band,
+                f'{name}Middle': middle,
+                f'{name}Lower': middle - band,
+            }
+        if name.startswith('ema'):
+            # The cached EMA and one seeded at the window start follow the same
+            # recursion, so they differ by a term that decays by (1 - alpha) per bar
+            ema = state['ema'][bars]
+            decay = (1 - 2 / (window + 1)) ** index
+            ema = ema - decay * (ema[0] - price[offset])
+            return {name: np.where(index < window - 1, np.nan, ema)}
+        if name.startswith('rsi'):
+            avg_gain, avg_loss = np.full(length, np.nan), np.full(length, np.nan)
+            if length > 1:
+                # Rebase the cached averages onto the window's first price change, as for EMA
+                delta = price[offset + 1] - price[offset]
+                decay = (1 - 1 / window) ** index[:-1]
+                gain, loss = state['avgGain'][bars][1:], state['avgLoss'][bars][1:]
+                avg_gain[1:] = gain - decay * (gain[0] - max(delta, 0))
+                avg_loss[1:] = loss - decay * (loss[0] - max(-delta, 0))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+            # No losses: overbought if there were gains, neutral if the price was flat
+            rsi = np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), rsi)
+            return {name: np.where(index < window, np.nan, rsi)}
+
+        # Anchor VWAP at the window start rather than the start of the cached series
+        cum_pv, cum_volume = state['cumPv'][bars], state['cumVolume'][bars]
+        if offset > 0:
+            cum_pv = cum_pv - state['cumPv'][offset - 1]
+            cum_volume = cum_volume - state['cumVolume'][offset - 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.where(cum_volume > 0, cum_pv / cum_volume, np.nan)
+        return {name: vwap}
+
+    @staticmethod
+    def _round(value: float) -> Optional[float]:
+        """Round an indicator value, mapping NaN to None for JSON."""
+        if np.isnan(value):
+            return None
+        return round(value, 2) if abs(value) > 1 else round(value, 6)
+
+
+def _rolling_tail(values: np.ndarray, window: int, start: int, aggregate) -> np.ndarray:
+    """Apply a rolling aggregate to values[start:], reading back only as far as the window needs."""
+    offset = max(start - window + 1, 0)
+    rolled = aggregate(pd.Series(values[offset:]).rolling(window))
+    return rolled.to_numpy()[start - offset:]
+
+
+def _ewm(values: np.ndarray, alpha: float, seed: Optional[float] = None) -> np.ndarray:
+    """Exponentially weighted mean, optionally continuing from a previous value."""
+    if seed is None:
+        return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    seeded = np.concatenate(([seed], values))
+    return pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
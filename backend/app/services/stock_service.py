@@ -3,15 +3,32 @@ import pandas as pd
 from typing import List, Dict, Optional
 from datetime import datetime
 import requests
+from app.services.indicator_service import IndicatorService
 
 
 class StockService:
     """Service for fetching S&P 500 stock data."""
 
+    INTRADAY_INTERVALS = ['1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h']
+
     def __init__(self):
         self._sp500_symbols: Optional[List[str]] = None
         self._symbols_cache_time: Optional[datetime] = None
         self._cache_duration_hours = 24
+        self._history_cache: Dict = {}
+        self._indicators = IndicatorService()
+
+    def _get_cached_or_fetch(self, cache_key: str, fetch_fn, cache_duration: int = 60):
+        """Generic caching helper."""
+        now = datetime.now()
+        if cache_key in self._history_cache:
+            cached_data, cached_time = self._history_cache[cache_key]
+            if (now - cached_time).total_seconds() < cache_duration:
+                return cached_data
+
+        data = fetch_fn()
+        self._history_cache[cache_key] = (data, now)
+        return data
 
     def get_sp500_symbols(self) -> List[str]:
         """Fetch S&P 500 symbols from Wikipedia."""
@@ -105,8 +122,20 @@ class StockService:
             print(f"Error fetching details for {symbol}: {e}")
             return None
 
-    def get_stock_history(self, symbol: str, period: str = '1mo', interval: str = '1d') -> List[Dict]:
-        """Get historical price data for a stock."""
+    def get_stock_history(self, symbol: str, period: str = '1mo', interval: str = '1d',
+                          indicators: Optional[List[str]] = None) -> List[Dict]:
+        """Get historical price data for a stock, optionally with technical indicators."""
+        cache_duration = 60 if interval in self.INTRADAY_INTERVALS else 300  # Longer cache for daily bars
+        history = self._get_cached_or_fetch(
+            f'stock_history_{symbol}_{period}_{interval}',
+            lambda: self._fetch_stock_history(symbol, period, interval),
+            cache_duration
+        )
+        # Indicator state is shared by every period with the same bars
+        return self._indicators.apply(f'stock_{symbol}_{interval}', history, indicators)
+
+    def _fetch_stock_history(self, symbol: str, period: str, interval: str) -> List[Dict]:
+        """Fetch historical price data for a stock."""
         try:
             ticker = yf.Ticker(symbol)
             hist = ticker.history(period=period, interval=interval)
@@ -114,7 +143,7 @@ class StockService:
             history = []
             for date, row in hist.iterrows():
                 history.append({
-                    'date': date.strftime('%Y-%m-%d %H:%M:%S') if interval in ['1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h'] else date.strftime('%Y-%m-%d'),
+                    'date': date.strftime('%Y-%m-%d %H:%M:%S') if interval in self.INTRADAY_INTERVALS else date.strftime('%Y-%m-%d'),
                     'open': round(row['Open'], 2),
                     'high': round(row['High'], 2),
                     'low': round(row['Low'], 2),
@@ -0,0 +1,218 @@
+import math
+import pytest
+from app import create_app
+from app.routes import stocks, crypto
+from app.services.indicator_service import IndicatorService
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    app = create_app('development')
+    app.config['TESTING'] = True
+
+    with app.test_client() as client:
+        yield client
+
+
+def make_history(count, start=0):
+    """Create synthetic OHLCV bars."""
+    history = []
+    for i in range(start, start + count):
+        close = 100 + 10 * math.sin(i / 3) + i * 0.5
+        history.append({
+            'date': f'2024-01-{i + 1:03d}',
+            'open': close - 1,
+            'high': close + 2,
+            'low': close - 2,
+            'close': close,
+            'volume': 1000 + i * 10,
+        })
+    return history
+
+
+def test_parse_indicators():
+    """Test indicator list parsing."""
+    assert IndicatorService.parse_indicators(None) == []
+    assert IndicatorService.parse_indicators('SMA20, ema50,rsi14,sma20,vwap') == ['sma20', 'ema50', 'rsi14', 'vwap']
+    with pytest.raises(ValueError):
+        IndicatorService.parse_indicators('sma20,vwap', allow_vwap=False)
+
+
+@pytest.mark.parametrize('spec', ['macd', 'sma', 'sma0', 'ema100000'])
+def test_parse_indicators_invalid(spec):
+    """Test that unknown indicators and bad windows are rejected."""
+    with pytest.raises(ValueError):
+        IndicatorService.parse_indicators(spec)
+
+
+def test_sma_and_bollinger_values():
+    """Test SMA and Bollinger band values against a direct calculation."""
+    history = make_history(30)
+    result = IndicatorService().apply('key', history, ['sma5', 'bb5'])
+
+    closes = [bar['close'] for bar in history[-5:]]
+    mean = sum(closes) / 5
+    std = math.sqrt(sum((c - mean) ** 2 for c in closes) / 5)
+
+    assert result[3]['sma5'] is None
+    assert result[-1]['sma5'] == round(mean, 2)
+    assert result[-1]['bb5Upper'] == round(mean + 2 * std, 2)
+    assert result[-1]['bb5Lower'] == round(mean - 2 * std, 2)
+    assert 'sma5' not in history[-1]
+
+
+def test_rsi_bounds():
+    """Test RSI warm-up and range."""
+    result = IndicatorService().apply('key', make_history(40), ['rsi14'])
+    assert result[13]['rsi14'] is None
+    assert all(0 <= bar['rsi14'] <= 100 for bar in result[14:])
+
+
+def test_rsi_flat_series():
+    """Test that a flat price gives a neutral RSI."""
+    history = [dict(bar, close=100.0) for bar in make_history(20)]
+    result = IndicatorService().apply('key', history, ['rsi14'])
+    assert result[-1]['rsi14'] == 50.0
+
+
+def test_incremental_update_matches_full_recompute():
+    """Test that appending bars gives the same values as computing from scratch."""
+    indicators = ['sma20', 'ema10', 'rsi14', 'bb20', 'vwap']
+    full_history = make_history(60)
+
+    service = IndicatorService()
+    service.apply('key', full_history[:50], indicators)
+    # Revise the last cached bar as an in-progress candle would
+    revised = [dict(bar) for bar in full_history[:50]]
+    revised[-1]['close'] += 3
+    service.apply('key', revised, indicators)
+    incremental = service.apply('key', full_history, indicators)
+
+    expected = IndicatorService().apply('key', full_history, indicators)
+    assert incremental == expected
+
+
+def test_price_only_series():
+    """Test indicators on crypto-style history without OHLC fields."""
+    history = [{'date': f'2024-01-{i + 1:02d}', 'price': 1 + i * 0.01, 'volume': 100} for i in range(10)]
+    result = IndicatorService().apply('key', history, ['sma3', 'vwap'], price_key='price')
+    assert result[-1]['sma3'] == round((1.07 + 1.08 + 1.09) / 3, 2)
+    assert result[-1]['vwap'] == round(sum(bar['price'] for bar in history) / 10, 2)
+
+
+def test_sliding_window_refetch_is_incremental(monkeypatch):
+    """Test that a sliding window refetch reuses state and only computes the new bar."""
+    indicators = ['sma5', 'bb5', 'ema10', 'rsi14', 'vwap']
+    bars = make_history(40)
+    service = IndicatorService()
+    service.apply('key', bars[:30], indicators)
+
+    computed = []
+    compute = service._compute
+    monkeypatch.setattr(service, '_compute', lambda name, series, prev, start: computed.append(start) or compute(name, series, prev, start))
+    result = service.apply('key', bars[1:31], indicators)
+
+    assert computed == [30] * len(indicators)
+    assert len(result) == 30
+    assert result[0]['date'] == bars[1]['date']
+
+    assert result == IndicatorService().apply('other', bars[1:31], indicators)
+
+
+def test_values_do_not_depend_on_cached_bars():
+    """Test that a short window gives the same values whether or not a longer one was cached."""
+    indicators = ['sma20', 'bb20', 'ema50', 'rsi14', 'vwap']
+    bars = make_history(250)
+    service = IndicatorService()
+    service.apply('key', bars, indicators)
+
+    result = service.apply('key', bars[-21:], indicators)
+    assert result == IndicatorService().apply('other', bars[-21:], indicators)
+    assert result[0]['sma20'] is None
+    assert all(bar['ema50'] is None for bar in result)
+
+
+def test_readjusted_history_is_rebuilt():
+    """Test that back-adjusted history (e.g. after a 2:1 split) is not spliced onto old bars."""
+    indicators = ['sma20', 'ema10', 'rsi14']
+    bars = make_history(250)
+    service = IndicatorService()
+    service.apply('key', bars, indicators)
+
+    adjusted = [
+        dict(bar, **{field: bar[field] / 2 for field in ['open', 'high', 'low', 'close']})
+        for bar in bars
+    ]
+    result = service.apply('key', adjusted[-21:], indicators)
+    assert result == IndicatorService().apply('other', adjusted[-21:], indicators)
+    assert service._series['key']['series']['price'].tolist() == [bar['close'] for bar in adjusted[-21:]]
+    assert service.apply('key', adjusted, indicators) == IndicatorService().apply('other', adjusted, indicators)
+
+
+def test_unrelated_series_do_not_share_a_lock():
+    """Test that one series' computation does not block another's."""
+    service = IndicatorService()
+    keys = [key for key in ('a', 'b', 'c', 'd') if hash(key) % service.LOCK_STRIPES != hash('a') % service.LOCK_STRIPES]
+    with service._series_locks[hash('a') % service.LOCK_STRIPES]:
+        assert service.apply(keys[0], make_history(10), ['sma5'])[-1]['sma5'] is not None
+
+
+def test_same_history_object_skips_merge(monkeypatch):
+    """Test that a cached history object is not rescanned."""
+    history = make_history(30)
+    service = IndicatorService()
+    first = service.apply('key', history, ['sma5'])
+
+    monkeypatch.setattr(service, '_merge', lambda *args: pytest.fail('history should not be merged again'))
+    assert service.apply('key', history, ['sma5']) == first
+
+
+def test_cache_is_bounded(monkeypatch):
+    """Test that the least recently used series are evicted."""
+    monkeypatch.setattr(IndicatorService, 'MAX_SERIES', 2)
+    service = IndicatorService()
+    for key in ['a', 'b', 'c']:
+        service.apply(key, make_history(10), ['sma5'])
+    service.apply('d', make_history(10), ['sma5'])
+    assert list(service._series) == ['c', 'd']
+
+
+def test_stock_history_indicators_endpoint(client, monkeypatch):
+    """Test indicators on the stock history endpoint."""
+    monkeypatch.setattr(stocks.stock_service, '_history_cache', {})
+    monkeypatch.setattr(stocks.stock_service, '_fetch_stock_history', lambda symbol, period, interval: make_history(30))
+
+    response = client.get('/api/stocks/TEST/history?indicators=sma5,bb5,vwap')
+    assert response.status_code == 200
+    bar = response.get_json()['data'][-1]
+    assert {'sma5', 'bb5Upper', 'bb5Middle', 'bb5Lower', 'vwap'} <= set(bar)
+
+    response = client.get('/api/stocks/TEST/history?indicators=macd')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_crypto_history_indicators_endpoint(client, monkeypatch):
+    """Test indicators on the crypto history endpoint."""
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {
+                'prices': [[1704067200000 + i * 86400000, 100 + i] for i in range(30)],
+                'total_volumes': [[1704067200000 + i * 86400000, 1000] for i in range(30)],
+            }
+
+    monkeypatch.setattr(crypto.crypto_service, '_cache', {})
+    monkeypatch.setattr('app.services.crypto_service.requests.get', lambda *args, **kwargs: FakeResponse())
+
+    response = client.get('/api/crypto/test-coin/history?indicators=ema10,rsi14')
+    assert response.status_code == 200
+    bar = response.get_json()['data'][-1]
+    assert bar['ema10'] is not None
+    assert bar['rsi14'] == 100.0
+
+    response = client.get('/api/crypto/test-coin/history?indicators=vwap')
+    assert response.status_code == 400